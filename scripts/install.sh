@@ -61,6 +61,9 @@ fi
 
 python setup.py install
 
+# build the optional speedup module in place, so that the tests cover it
+(cd wradlib && f2py -c -m speedup speedup.f)
+
 # print some stuff
 python --version
 pip --version
@@ -32,11 +32,10 @@ This includes for example:
 
 """
 
-from functools import reduce
+import copy
 import re
 import scipy
-from scipy.spatial import cKDTree
-from scipy.interpolate import LinearNDInterpolator
+from scipy.spatial import cKDTree, Delaunay
 from scipy.ndimage.interpolation import map_coordinates
 from scipy.interpolate import griddata
 import numpy as np
@@ -44,6 +43,14 @@ import warnings
 
 from . import util as util
 
+# the fast Fortran implementation of the Idw reduction is optional, a speedup
+# module built from an older speedup.f does not provide it
+try:
+    from . import speedup as _speedup
+except ImportError:
+    _speedup = None
+_f_idw = getattr(_speedup, 'f_idw', None)
+
 
 class MissingSourcesError(Exception):
     """Is raised in case no source coordinates are available for interpolation.
@@ -122,13 +129,13 @@ class IpolBase():
 
         """
         if type(x) in [list, tuple]:
-            x = [item.ravel() for item in x]
-            x = np.array(x).transpose()
+            x = [np.asarray(item, dtype=np.float64).ravel() for item in x]
+            x = np.column_stack(x)
         elif type(x) == np.ndarray:
             if x.ndim == 1:
-                x = x.reshape(-1, 1)
+                x = np.ascontiguousarray(x, dtype=np.float64).reshape(-1, 1)
             elif x.ndim == 2:
-                pass
+                x = np.ascontiguousarray(x, dtype=np.float64)
             else:
                 raise Exception('Cannot deal wih 3-d arrays, yet.')
         return x
@@ -158,9 +165,134 @@ class IpolBase():
             return vals
 
 
+def _make_tree(src, leafsize=32, compact_nodes=False, balanced_tree=False,
+               copy_data=False):
+    """Plants a :class:`scipy:scipy.spatial.cKDTree` for the source points.
+
+    The defaults differ from those of cKDTree: the tree is queried only once
+    for all targets in bulk, so a fast construction (no median splits, no
+    shrinking of the hyperrectangles, no copy of the data) pays off. Pass
+    ``balanced_tree=True`` for pathologically distributed source points.
+
+    With ``copy_data=False`` the tree references `src` itself, which may be
+    the array passed in by the caller. It must not be modified as long as the
+    tree is in use, e.g. by :meth:`Idw.query_subset`.
+
+    Among several equally distant neighbours, the tree may pick another one
+    than a tree with the cKDTree defaults. Pass ``compact_nodes=True`` and
+    ``balanced_tree=True`` to reproduce those results exactly.
+
+    Parameters
+    ----------
+    src : ndarray of floats, shape (npoints, ndims)
+        Data point coordinates of the source points.
+    leafsize : int
+    compact_nodes : bool
+    balanced_tree : bool
+    copy_data : bool
+        see :class:`scipy:scipy.spatial.cKDTree`
+
+    Returns
+    -------
+    tree : :class:`scipy:scipy.spatial.cKDTree`
+    """
+    return cKDTree(src, leafsize=leafsize, compact_nodes=compact_nodes,
+                   balanced_tree=balanced_tree, copy_data=copy_data)
+
+
+def _query_tree(tree, x, k, workers=-1):
+    """Queries the tree for the k nearest neighbours of x using parallel
+    workers.
+
+    Older scipy versions name the argument ``n_jobs`` or do not support
+    parallel queries at all, in which case the query runs serially.
+
+    Parameters
+    ----------
+    tree : :class:`scipy:scipy.spatial.cKDTree`
+    x : ndarray of floats, shape (npoints, ndims)
+    k : int
+        number of nearest neighbours
+    workers : int
+        number of parallel workers, -1 uses all CPUs
+
+    Returns
+    -------
+    dists, ix : see :meth:`scipy:scipy.spatial.cKDTree.query`
+    """
+    try:
+        return tree.query(x, k=k, workers=workers)
+    except TypeError:
+        pass
+    try:
+        return tree.query(x, k=k, n_jobs=workers)
+    except TypeError:
+        return tree.query(x, k=k)
+
+
+def _query_tree_excluding(tree, x, k, exclude, workers=-1):
+    """Queries the tree for the k nearest neighbours of x, skipping the
+    source points flagged in exclude.
+
+    The tree is queried in rounds, doubling the number of neighbours only for
+    the points which still lack k valid ones. Points which do not find them
+    within 8 * k neighbours (e.g. in the middle of a large excluded area) are
+    queried in a tree of the valid source points.
+
+    Parameters
+    ----------
+    tree : :class:`scipy:scipy.spatial.cKDTree`
+    x : ndarray of floats, shape (npoints, ndims)
+    k : int
+        number of nearest neighbours
+    exclude : ndarray of bool, shape (tree.n,)
+        True for source points which must not be used
+    workers : int
+        number of parallel workers, -1 uses all CPUs
+
+    Returns
+    -------
+    dists, ix : ndarrays of shape (npoints, k)
+        distances to and indices of the nearest valid neighbours
+    """
+    dists = np.empty((len(x), k))
+    ix = np.empty((len(x), k), dtype=np.intp)
+    todo = np.arange(len(x))
+    kq = k
+    while len(todo) and kq <= 8 * k:
+        kq = min(kq, tree.n)
+        d, i = _query_tree(tree, x[todo], kq, workers)
+        d = d.reshape(len(todo), kq)
+        i = i.reshape(len(todo), kq)
+        # missing neighbours are flagged with an index of tree.n
+        valid = np.isfinite(d)
+        valid[valid] = ~exclude[i[valid]]
+        done = valid.sum(axis=1) >= k
+        # move the valid neighbours to the front, keeping their order
+        order = np.argsort(~valid[done], axis=1, kind='mergesort')[:, :k]
+        rows = np.arange(len(order))[:, np.newaxis]
+        dists[todo[done]] = d[done][rows, order]
+        ix[todo[done]] = i[done][rows, order]
+        todo = todo[~done]
+        if kq == tree.n:
+            break
+        kq *= 2
+    if len(todo):
+        good = np.flatnonzero(~exclude)
+        d, i = _query_tree(_make_tree(tree.data[good]), x[todo],
+                           min(k, len(good)), workers)
+        d = d.reshape(len(todo), -1)
+        i = i.reshape(len(todo), -1)
+        dists[todo] = np.inf
+        ix[todo] = tree.n
+        dists[todo, :d.shape[1]] = d
+        ix[todo, :d.shape[1]] = good[i]
+    return dists, ix
+
+
 class Nearest(IpolBase):
     """
-    Nearest(src, trg)
+    Nearest(src, trg, workers=-1, **kwargs)
 
     Nearest-neighbour interpolation in N dimensions.
 
@@ -170,6 +302,16 @@ class Nearest(IpolBase):
         Data point coordinates of the source points.
     trg : ndarray of floats, shape (npoints, ndims)
         Data point coordinates of the target points.
+    workers : integer - number of parallel workers for the tree query,
+        -1 uses all CPUs
+
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :class:`scipy:scipy.spatial.cKDTree`
+        defaults are tuned for fast construction (leafsize=32,
+        compact_nodes=False, balanced_tree=False, copy_data=False), the
+        source coordinates must therefore not be modified while the
+        interpolator is in use
 
     Examples
     --------
@@ -182,7 +324,7 @@ class Nearest(IpolBase):
 
     """
 
-    def __init__(self, src, trg):
+    def __init__(self, src, trg, workers=-1, **kwargs):
         src = self._make_coord_arrays(src)
         trg = self._make_coord_arrays(trg)
         # remember some things
@@ -193,8 +335,9 @@ class Nearest(IpolBase):
         if self.numsources == 0:
             raise MissingSourcesError
         # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=1)
+        self.workers = workers
+        self.tree = _make_tree(src, **kwargs)
+        self.dists, self.ix = _query_tree(self.tree, trg, 1, workers)
 
     def __call__(self, vals, maxdist=None):
         """
@@ -220,10 +363,44 @@ class Nearest(IpolBase):
         else:
             return np.where(self.dists > maxdist, np.nan, out)
 
+    def query_subset(self, trg, exclude):
+        """
+        Nearest-neighbour interpolator for other target points, which ignores
+        some of the source points.
+
+        The tree of this interpolator is reused, so this is much cheaper than
+        setting up a new interpolator for the remaining source points.
+
+        Parameters
+        ----------
+        trg : ndarray of floats, shape (npoints, ndims)
+            Data point coordinates of the target points.
+        exclude : ndarray of bool, shape (numsourcepoints,)
+            True for the source points which must not be used
+
+        Returns
+        -------
+        ip : :class:`Nearest`
+            interpolator which is evaluated for values at all source points
+            of this interpolator, the excluded values are never used
+        """
+        trg = self._make_coord_arrays(trg)
+        exclude = np.asarray(exclude, dtype=bool)
+        if len(trg) == 0:
+            raise MissingTargetsError
+        if np.all(exclude):
+            raise MissingSourcesError
+        ip = copy.copy(self)
+        ip.numtargets = len(trg)
+        dists, ix = _query_tree_excluding(self.tree, trg, 1, exclude,
+                                          self.workers)
+        ip.dists, ip.ix = dists[:, 0], ix[:, 0]
+        return ip
+
 
 class Idw(IpolBase):
     """
-    Idw(src, trg, nnearest=4, p=2.)
+    Idw(src, trg, nnearest=4, p=2., workers=-1, **kwargs)
 
     Inverse distance weighting interpolation in N dimensions.
 
@@ -235,6 +412,16 @@ class Idw(IpolBase):
         Data point coordinates of the target points.
     nnearest : integer - max. number of neighbours to be considered
     p : float - inverse distance power used in 1/dist**p
+    workers : integer - number of parallel workers for the tree query,
+        -1 uses all CPUs
+
+    Keyword Arguments
+    -----------------
+    **kwargs : keyword arguments of :class:`scipy:scipy.spatial.cKDTree`
+        defaults are tuned for fast construction (leafsize=32,
+        compact_nodes=False, balanced_tree=False, copy_data=False), the
+        source coordinates must therefore not be modified while the
+        interpolator is in use
 
     Examples
     --------
@@ -244,9 +431,17 @@ class Idw(IpolBase):
     ----
     Uses :class:`scipy:scipy.spatial.cKDTree`
 
+    The interpolation weights are calculated during initialization, because
+    these only depend on the configuration of the points. Calling the object
+    repeatedly with different values (e.g. time steps) is therefore cheap.
+
+    The weights may be retrieved from the attribute `weights` and the indices
+    of the corresponding source points from the attribute `ix`, both of shape
+    (numtargetpoints, nnearest).
+
     """
 
-    def __init__(self, src, trg, nnearest=4, p=2.):
+    def __init__(self, src, trg, nnearest=4, p=2., workers=-1, **kwargs):
         src = self._make_coord_arrays(src)
         trg = self._make_coord_arrays(trg)
         # remember some things
@@ -268,14 +463,63 @@ class Idw(IpolBase):
             self.nnearest = nnearest
         self.p = p
         # plant a tree
-        self.tree = cKDTree(src)
-        self.dists, self.ix = self.tree.query(trg, k=self.nnearest)
+        self.workers = workers
+        self.tree = _make_tree(src, **kwargs)
+        self._set_neighbours(*_query_tree(self.tree, trg, self.nnearest,
+                                          workers))
+        # the weights only depend on the configuration of the points, so
+        # they are calculated once here and reused for every call
+        self._w, self._exact = self._weights()
+
+    @property
+    def weights(self):
+        """Normalised interpolation weights of shape (numtargets, nnearest)
+        for the source points given by `ix`.
+        """
+        w = self._w.view()
+        w.setflags(write=False)
+        return w
+
+    def _set_neighbours(self, dists, ix):
+        """Stores distances and indices of the nearest neighbours as arrays of
+        shape (numtargets, nnearest).
+
+        Distances are kept in single precision and indices as 32 bit integers
+        (as long as the number of source points allows), which halves the
+        memory of the interpolator. The result is single precision anyway.
+        """
         # avoid bug, if there is only one neighbor at all
-        if self.dists.ndim == 1:
-            self.dists = self.dists[:, np.newaxis]
-            self.ix = self.ix[:, np.newaxis]
+        self.dists = dists.reshape(-1, self.nnearest).astype(np.float32,
+                                                             copy=False)
+        ix = ix.reshape(-1, self.nnearest)
+        if self.numsources < np.iinfo(np.int32).max:
+            ix = ix.astype(np.int32, copy=False)
+        self.ix = ix
 
-    def __call__(self, vals):
+    def _weights(self):
+        """Calculates the normalised interpolation weights from the distances
+        of the targets to their nearest neighbours.
+
+        Returns
+        -------
+        w : ndarray of float32, shape (numtargets, nnearest)
+        exact : ndarray of int
+            indices of the targets which coincide with a source point
+        """
+        # weight z values by (1/dist)**p -- scaled by the smallest distance
+        # of each target, which cancels out in the normalisation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            w = (self.dists[:, :1] / self.dists) ** self.p
+        # non-finite distances (missing neighbours) do not contribute
+        w[~np.isfinite(self.dists)] = 0.
+        # if a target point coincides with a source point
+        exact = self.dists[:, 0] < 1e-10
+        w[exact] = 0.
+        w[exact, 0] = 1.
+        w /= w.sum(axis=1, keepdims=True)
+        return w.astype(np.float32, copy=False), np.flatnonzero(exact)
+
+    def __call__(self, vals, out=None):
         """
         Evaluate interpolator for values given at the source points.
 
@@ -283,57 +527,81 @@ class Idw(IpolBase):
         ----------
         vals : ndarray of float, shape (numsourcepoints, ...)
             Values at the source points which to interpolate
-        maxdist : the maximum distance up to which an interpolated values is
-            assigned - if maxdist is exceeded, np.nan will be assigned
-            If maxdist==None, values will be assigned everywhere
+        out : ndarray of float, shape (numtargetpoints, ...), optional
+            array into which the result is written, e.g. a slice of a
+            preallocated volume. A new float32 array is allocated if not
+            given.
 
         Returns
         -------
         output : ndarray of float with shape (numtargetpoints,...)
+            if given, this is `out`
 
         """
-
-        # self distances: a list of arrays of distances of the nearest points
-        # which are indicated by self.ix
         self._check_shape(vals)
-        outshape = list(vals.shape)
-        outshape[0] = len(self.dists)
-        interpol = (np.repeat(np.nan, util._shape2size(outshape)).
-                    reshape(tuple(outshape)).astype('f4'))
-        # weights is the container for the weights (a list)
-        weights = list(range(len(self.dists)))
-        # sources is the container for the source point indices
-        src_ix = list(range(len(self.dists)))
-        # jinterpol is the jth element of interpol
-        jinterpol = 0
-        for dist, ix in zip(self.dists, self.ix):
-            valid_dists = np.where(np.isfinite(dist))[0]
-            dist = dist[valid_dists]
-            ix = ix[valid_dists]
-            if self.nnearest == 1:
-                # defaults to nearest neighbour
-                wz = vals[ix]
-                w = 1.
-            elif dist[0] < 1e-10:
-                # if a target point coincides with a source point
-                wz = vals[ix[0]]
-                w = 1.
-            else:
-                # weight z values by (1/dist)**p --
-                w = 1. / dist ** self.p
-                w /= np.sum(w)
-                wz = np.dot(w, vals[ix])
-            interpol[jinterpol] = wz.ravel()
-            weights[jinterpol] = w
-            src_ix[jinterpol] = ix
-            jinterpol += 1
-        return interpol  # if self.qdim > 1  else interpol[0]
+        if out is None:
+            out = np.empty((self.numtargets,) + vals.shape[1:], dtype='f4')
+        if (vals.ndim == 1 and _f_idw is not None and
+                out.dtype == np.float32 and out.flags.c_contiguous):
+            # fused gather and reduction, no (numtargets, nnearest) temporary
+            _f_idw(self._w.T, self.ix.T, vals, out)
+            return out
+        # evaluate blocks of targets, which bounds the memory of the gathered
+        # neighbour values and keeps them in cache for large grids
+        nvals = max(1, self.nnearest * int(np.prod(vals.shape[1:])))
+        nblock = max(1, 2 ** 16 // nvals)
+        for start in range(0, self.numtargets, nblock):
+            block = slice(start, start + nblock)
+            np.einsum('tk,tk...->t...', self._w[block], vals[self.ix[block]],
+                      out=out[block], casting='same_kind')
+        # targets which coincide with a source point take its value, even if
+        # other neighbours are NaN (their zero weights would still give NaN)
+        if self._exact.size:
+            out[self._exact] = vals[self.ix[self._exact, 0]]
+        return out
+
+    def query_subset(self, trg, exclude):
+        """
+        Inverse distance weighting interpolator for other target points,
+        which ignores some of the source points.
+
+        The tree of this interpolator is reused, so this is much cheaper than
+        setting up a new interpolator for the remaining source points.
+
+        Parameters
+        ----------
+        trg : ndarray of floats, shape (npoints, ndims)
+            Data point coordinates of the target points.
+        exclude : ndarray of bool, shape (numsourcepoints,)
+            True for the source points which must not be used
+
+        Returns
+        -------
+        ip : :class:`Idw`
+            interpolator which is evaluated for values at all source points
+            of this interpolator, the excluded values are never used
+        """
+        trg = self._make_coord_arrays(trg)
+        exclude = np.asarray(exclude, dtype=bool)
+        if len(trg) == 0:
+            raise MissingTargetsError
+        ngood = self.numsources - np.count_nonzero(exclude)
+        if ngood == 0:
+            raise MissingSourcesError
+        ip = copy.copy(self)
+        ip.numtargets = len(trg)
+        ip.nnearest = min(self.nnearest, ngood)
+        ip._set_neighbours(*_query_tree_excluding(self.tree, trg, ip.nnearest,
+                                                  exclude, self.workers))
+        ip._w, ip._exact = ip._weights()
+        return ip
 
 
 class Linear(IpolBase):
     """
-    Interface to the :class:`scipy:scipy.interpolate.LinearNDInterpolator`
-    class.
+    Linear interpolation in N dimensions on the Delaunay triangulation of the
+    source points, equivalent to
+    :class:`scipy:scipy.interpolate.LinearNDInterpolator`.
 
     We provide this class in order to achieve a uniform interface for all
     Interpolator classes
@@ -348,18 +616,38 @@ class Linear(IpolBase):
     Examples
     --------
     See :ref:`notebooks/interpolation/wradlib_ipol_example.ipynb`.
+
+    Note
+    ----
+    The Delaunay triangulation of the source points
+    (:class:`scipy:scipy.spatial.Delaunay`) and the barycentric coordinates
+    of the target points are calculated during initialization, because these
+    only depend on the configuration of the points. The call method then
+    only combines the values at the vertices of the enclosing simplices.
     """
 
     def __init__(self, src, trg):
         self.src = self._make_coord_arrays(src)
         self.trg = self._make_coord_arrays(trg)
         # remember some things
-        self.numtargets = len(trg)
+        self.numtargets = len(self.trg)
         if self.numtargets == 0:
             raise MissingTargetsError
-        self.numsources = len(src)
+        self.numsources = len(self.src)
         if self.numsources == 0:
             raise MissingSourcesError
+        # triangulate the source points
+        tri = Delaunay(self.src)
+        # find the enclosing simplex of each target point
+        simplex = tri.find_simplex(self.trg)
+        self._outside = simplex == -1
+        self._vertices = tri.simplices[simplex]
+        # barycentric coordinates of the target points within their simplex
+        ndim = tri.ndim
+        trans = tri.transform[simplex]
+        bary = np.einsum('tij,tj->ti', trans[:, :ndim],
+                         self.trg - trans[:, ndim])
+        self._bary = np.hstack((bary, 1. - bary.sum(axis=1, keepdims=True)))
 
     def __call__(self, vals, fill_value=np.nan):
         """
@@ -378,52 +666,62 @@ class Linear(IpolBase):
 
         """
         self._check_shape(vals)
-        ip = LinearNDInterpolator(self.src, vals, fill_value=fill_value)
-        return ip(self.trg)
+        ip = np.einsum('tv,tv...->t...', self._bary, vals[self._vertices])
+        ip[self._outside] = fill_value
+        return ip
 
 
 # -----------------------------------------------------------------------------
 # Covariance routines needed for Kriging
 # -----------------------------------------------------------------------------
+# pattern of a single covariogram subpart, e.g. "1.0 Exp(10000.)" or
+# "1.0 Cau(10.)^1.0^2.0": sill, model, range and up to two shape parameters
+_cov_pattern = re.compile(r'([\d\.]+)\s*(Nug|Lin|Sph|Exp|Gau|Mat|Pow|Cau)'
+                          r'\(([\d\.]+)\)(?:\^([\d\.]+))?(?:\^([\d\.]+))?')
+
+
 def parse_covariogram(cov_model):
     """"""
-    patterns = [re.compile('([\d\.]+) Nug\(([\d\.]+)\)'),  # nugget
-                re.compile('([\d\.]+) Lin\(([\d\.]+)\)'),  # linear
-                re.compile('([\d\.]+) Sph\(([\d\.]+)\)'),  # spherical
-                re.compile('([\d\.]+) Exp\(([\d\.]+)\)'),  # exponential
-                re.compile('([\d\.]+) Gau\(([\d\.]+)\)'),  # gaussian
-                re.compile('([\d\.]+) Mat\(([\d\.]+)\)\^([\d\.]+)'),  # matern
-                re.compile('([\d\.]+) Pow\(([\d\.]+)\)'),  # power
-                # cauchy
-                re.compile('([\d\.]+) Cau\(([\d\.]+)\)\^([\d\.]+)\^([\d\.]+)'),
-                ]
-
-    cov_funs = [cov_nug,
-                cov_lin,
-                cov_sph,
-                cov_exp,
-                cov_gau,
-                cov_mat,
-                cov_pow,
-                cov_cau,
-                ]
+    # covariance function and number of its shape parameters
+    cov_funs = {'Nug': (cov_nug, 0),  # nugget
+                'Lin': (cov_lin, 0),  # linear
+                'Sph': (cov_sph, 0),  # spherical
+                'Exp': (cov_exp, 0),  # exponential
+                'Gau': (cov_gau, 0),  # gaussian
+                'Mat': (cov_mat, 1),  # matern
+                'Pow': (cov_pow, 0),  # power
+                'Cau': (cov_cau, 2),  # cauchy
+                }
 
     funcs = []
 
-    # first split along '+'
-    subparts = cov_model.split('+')
-    # then analyse subparts
-    for i, subpart in enumerate(subparts):
-        # iterate over all available patterns
-        for j, pattern in enumerate(patterns):
-            m = pattern.search(subpart)
-            if m:
-                params = [float(p) for p in m.groups()]
-                funcs.append(_make_cov(cov_funs[j], params))
+    # analyse all subparts in a single pass
+    for m in _cov_pattern.finditer(cov_model):
+        sill, name, rng, shp1, shp2 = m.groups()
+        func, nshp = cov_funs[name]
+        shapes = [p for p in (shp1, shp2) if p is not None]
+        if len(shapes) < nshp:
+            raise ValueError('Covariogram subpart "%s" needs %d shape '
+                             'parameter(s) given as ^value.'
+                             % (m.group(0), nshp))
+        # surplus shape parameters are ignored
+        params = [float(p) for p in [sill, rng] + shapes[:nshp]]
+        funcs.append(_make_cov(func, params))
+
+    if not funcs:
+        raise ValueError('Could not parse covariogram "%s".' % cov_model)
 
     # return complete covariance function, which adds
     # individual subparts
-    return lambda h: reduce(np.add, [f(h) for f in funcs])
+    def cov_func(h):
+        # accumulate the subparts in place, so that only the result and
+        # the current subpart are held in memory
+        c = np.asanyarray(funcs[0](h), dtype=np.float64)
+        for f in funcs[1:]:
+            c += f(h)
+        return c
+
+    return cov_func
 
 
 def _make_cov(func, params):
@@ -436,7 +734,9 @@ def cov_nug(h, sill, rng):
     Therefore, usually rng is set to 0
     """
     h = np.asanyarray(h)
-    return np.where(h <= rng, sill, 0.)
+    c = np.zeros(h.shape)
+    c[h <= rng] = sill
+    return c
 
 
 def cov_exp(h, sill=1.0, rng=1.0):
@@ -448,9 +748,12 @@ def cov_exp(h, sill=1.0, rng=1.0):
 def cov_sph(h, sill=1.0, rng=1.0):
     """spherical type covariance function"""
     h = np.asanyarray(h)
-    return np.where(h < rng, sill * (1. - 1.5 * h /
-                                     rng + h ** 3 /
-                                     (2 * rng ** 3)), 0.)
+    # only evaluate the polynomial within the range
+    c = np.zeros(h.shape)
+    mask = h < rng
+    hr = h[mask] / rng
+    c[mask] = sill * (1. - 1.5 * hr + 0.5 * hr ** 3)
+    return c
 
 
 def cov_gau(h, sill=1.0, rng=1.0):
@@ -462,7 +765,11 @@ def cov_gau(h, sill=1.0, rng=1.0):
 def cov_lin(h, sill=1.0, rng=1.0):
     """linear covariance function"""
     h = np.asanyarray(h)
-    return np.where(h < rng, sill * (-h / rng + 1.), 0.)
+    # only evaluate the linear function within the range
+    c = np.zeros(h.shape)
+    mask = h < rng
+    c[mask] = sill * (1. - h[mask] / rng)
+    return c
 
 
 def cov_mat(h, sill=1.0, rng=1.0, shp=0.5):
@@ -477,16 +784,27 @@ def cov_mat(h, sill=1.0, rng=1.0, shp=0.5):
     if shp > 100:
         c = cov_gau(h, sill, rng)
     else:
-        # modified bessel function of second kind of order v
-        Kv = scipy.special.kv
-        # Gamma function
-        Tau = scipy.special.gamma
+        # the covariance at h == 0 is the sill, the expensive evaluation
+        # is only done for the remaining distances
+        c = np.full(h.shape, sill, dtype=np.float64)
+        mask = h != 0
+        fac1 = h[mask] / rng * 2.0 * np.sqrt(shp)
+        # closed forms for half-integer shape parameters
+        if shp == 0.5:
+            c[mask] = sill * np.exp(-fac1)
+        elif shp == 1.5:
+            c[mask] = sill * (1. + fac1) * np.exp(-fac1)
+        elif shp == 2.5:
+            c[mask] = sill * (1. + fac1 + fac1 ** 2 / 3.) * np.exp(-fac1)
+        else:
+            # modified bessel function of second kind of order v
+            Kv = scipy.special.kv
+            # Gamma function
+            Tau = scipy.special.gamma
 
-        fac1 = h / rng * 2.0 * np.sqrt(shp)
-        fac2 = (Tau(shp) * 2.0 ** (shp - 1.0))
+            fac2 = (Tau(shp) * 2.0 ** (shp - 1.0))
 
-        c = np.where(h != 0, sill * 1.0 /
-                     fac2 * fac1 ** shp * Kv(shp, fac1), sill)
+            c[mask] = sill * 1.0 / fac2 * fac1 ** shp * Kv(shp, fac1)
 
     return c
 
@@ -936,27 +1254,41 @@ def interpolate(src, trg, vals, Interpolator, *args, **kwargs):
     if vals.ndim == 1:
         # source values are one dimensional, we have just
         # to remove invalid data
-        ix_valid = np.where(np.isfinite(vals))[0]
-        ip = Interpolator(src[ix_valid], trg, *args, **kwargs)
-        result = ip(vals[ix_valid])
+        valid = np.isfinite(vals)
+        ip = Interpolator(src[valid], trg, *args, **kwargs)
+        result = ip(vals[valid])
     elif vals.ndim == 2:
         # this implementation for 2 dimensions needs generalization
         ip = Interpolator(src, trg, *args, **kwargs)
         result = ip(vals)
-        nan_in_result = np.where(np.isnan(result))
-        # nan_in_vals = np.where(np.isnan(vals))
-        for i in np.unique(nan_in_result[-1]):
-            ix_good = np.where(np.isfinite(vals[..., i]))[0]
-            ix_broken_targets = (nan_in_result[0]
-                                 [np.where(nan_in_result[-1] == i)[0]])
-            ip = Interpolator(src[ix_good],
-                              trg[nan_in_result[0]
-                              [np.where(nan_in_result[-1] == i)[0]]],
-                              *args, **kwargs)
-            tmp = ip(vals[ix_good, i].reshape((len(ix_good), -1)))
-            result[ix_broken_targets, i] = tmp.ravel()
+        nan_in_result = np.isnan(result)
+        cols_broken = np.where(np.any(nan_in_result, axis=0))[0]
+        # group the broken columns by their pattern of invalid source values
+        # so that only one Interpolator is set up per pattern
+        patterns, pattern_ix = np.unique(~np.isfinite(vals[:, cols_broken]),
+                                         axis=1, return_inverse=True)
+        pattern_ix = pattern_ix.ravel()
+        for i in range(patterns.shape[1]):
+            cols = cols_broken[pattern_ix == i]
+            ix_broken_targets = np.where(np.any(nan_in_result[:, cols],
+                                                axis=1))[0]
+            if hasattr(ip, 'query_subset'):
+                # reuse the tree of the interpolator for all source points
+                ip_sub = ip.query_subset(trg[ix_broken_targets],
+                                         patterns[:, i])
+                tmp = ip_sub(vals[:, cols])
+            else:
+                good = ~patterns[:, i]
+                ip_sub = Interpolator(src[good], trg[ix_broken_targets],
+                                      *args, **kwargs)
+                tmp = ip_sub(vals[np.ix_(good, cols)])
+            # only replace the results which are actually missing
+            broken = result[ix_broken_targets][:, cols]
+            missing = np.isnan(broken)
+            broken[missing] = tmp[missing]
+            result[ix_broken_targets[:, np.newaxis], cols] = broken
     else:
-        if not np.any(np.isnan(vals.ravel())):
+        if np.any(np.isnan(vals)):
             raise Exception(
                 'At the moment, <interpolate> can only deal with NaN values '
                 'in <vals> if vals has less than 3 dimension.')
@@ -964,10 +1296,50 @@ def interpolate(src, trg, vals, Interpolator, *args, **kwargs):
             # if no NaN value are in <vals> we can safely apply the
             # Interpolator as is
             ip = Interpolator(src, trg, *args, **kwargs)
-            result = ip(vals[ix_valid])
+            result = ip(vals)
     return result
 
 
+# cartesian bin coordinates of polar grids, keyed by (nazimuths, nranges)
+_polar_xy_cache = {}
+
+
+def _polar_xy(nazi, nrng):
+    """Cartesian coordinates of the bins of a polar grid with unit range
+    resolution and equidistant azimuths.
+
+    The coordinates only depend on the shape of the grid, so they are cached
+    per shape. The cache is emptied once it holds eight shapes. The returned
+    arrays are read-only.
+
+    Parameters
+    ----------
+    nazi : int
+        number of azimuths
+    nrng : int
+        number of range bins
+
+    Returns
+    -------
+    binx, biny : ndarrays of floats, shape (nazi * nrng,)
+    """
+    key = (nazi, nrng)
+    if key not in _polar_xy_cache:
+        # the ranges and angles of the bins
+        ranges = np.arange(0.5, nrng + 0.5)
+        angles = np.radians(np.arange(0, 360, 360. / nazi))
+        # calculate cartesian coordinates for every bin, the trigonometric
+        # functions only need to be evaluated once per azimuth
+        binx = (np.cos(angles)[:, np.newaxis] * ranges).ravel()
+        biny = (np.sin(angles)[:, np.newaxis] * ranges).ravel()
+        binx.setflags(write=False)
+        biny.setflags(write=False)
+        if len(_polar_xy_cache) >= 8:
+            _polar_xy_cache.clear()
+        _polar_xy_cache[key] = (binx, biny)
+    return _polar_xy_cache[key]
+
+
 def interpolate_polar(data, mask=None, Interpolator=Nearest):
     """
     Convenience function to interpolate polar data
@@ -1015,37 +1387,29 @@ def interpolate_polar(data, mask=None, Interpolator=Nearest):
     elif not np.any(mask):
         # mask contains no True values, so there is nothing to fill
         return data
-    clutter_indices = np.where(mask.ravel())
-    # construct the ranges for every bin
-    ranges = np.tile(np.arange(0.5, data.shape[1] + 0.5), data.shape[0])
-    # construct the angles for every bin
-    angles = np.repeat(np.radians(np.arange(0, 360, 360. / data.shape[0])),
-                       data.shape[1])
-    # calculate cartesian coordinates for every bin
-    binx = np.cos(angles) * ranges
-    biny = np.sin(angles) * ranges
+    mask_flat = np.asarray(mask, dtype=bool).ravel()
+    keep = ~mask_flat
+    # cartesian coordinates for every bin
+    binx, biny = _polar_xy(data.shape[0], data.shape[1])
     # calculate cartesian coordinates for bins, which are not masked
-    src_coord = np.array([(np.delete(binx, clutter_indices)),
-                          (np.delete(biny, clutter_indices))]).transpose()
+    src_coord = np.column_stack((binx[keep], biny[keep]))
     # calculate cartesian coordinates for bins, which are masked
-    trg_coord = np.array([binx[clutter_indices],
-                          biny[clutter_indices]]).transpose()
+    trg_coord = np.column_stack((binx[mask_flat], biny[mask_flat]))
     # data values for bins, which are not masked
-    values_list = np.delete(data, clutter_indices)
+    values_list = data.ravel()[keep]
     filled_data = data.copy().ravel()
     # interpolate masked bins
     filling = interpolate(src_coord, trg_coord, values_list, Interpolator)
     # fill data with the interpolations
-    filled_data[clutter_indices] = filling.astype(filled_data.dtype)
+    filled_data[mask_flat] = filling.astype(filled_data.dtype)
     # in case of nans as processed at the rim when interpolating linear,
     # these values are finally interpolated by nearest Neighbor interpolation
-    if np.any(np.isnan(filled_data)):
-        trg_coord = (np.array([binx[np.where(np.isnan(filled_data))],
-                              biny[np.where(np.isnan(filled_data))]])
-                     .transpose())
+    nan_mask = np.isnan(filled_data)
+    if nan_mask.any():
+        trg_coord = np.column_stack((binx[nan_mask], biny[nan_mask]))
         filling = interpolate(src_coord, trg_coord, values_list,
                               Interpolator=Nearest)
-        filled_data[np.where(np.isnan(filled_data))] = filling
+        filled_data[nan_mask] = filling
     return filled_data.reshape(data.shape[0], data.shape[1])
 
 
@@ -1148,7 +1512,7 @@ Read-DEM-Raster-Data`.
     xi = (nx - 1) * (xi - cxmin) / (cxmax - cxmin)
 
     # check origin to calculate y index
-    if util.get_raster_origin(cartgrid) is 'lower':
+    if util.get_raster_origin(cartgrid) == 'lower':
         yi = (ny - 1) * (yi - cymin) / (cymax - cymin)
     else:
         yi = ny - (ny - 1) * (yi - cymin) / (cymax - cymin)
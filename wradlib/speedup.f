@@ -68,3 +68,29 @@ C       Now start to check for phase folding
       ENDDO
       END
 
+      SUBROUTINE F_IDW(W, IX, VALS, OUT, K, NTRG, NSRC)
+C
+C     FORTRAN implementation of the inverse distance weighting reduction
+C     out(t) = sum_j w(j,t) * vals(ix(j,t)), ix holds 0-based indices
+C     neighbours with zero weight are skipped, so NaN values do not leak in
+C
+      INTEGER k, ntrg, nsrc
+      REAL*4 w(k,ntrg)
+      INTEGER ix(k,ntrg)
+      REAL*8 vals(nsrc)
+      REAL*4 out(ntrg)
+      INTEGER t, j
+      REAL*8 acc
+Cf2py intent(in) w, ix, vals, k, ntrg, nsrc
+Cf2py intent(inout) out
+
+      DO t=1, ntrg
+         acc = 0.
+         DO j=1, k
+            IF (w(j,t) .NE. 0.) THEN
+               acc = acc + w(j,t) * vals(ix(j,t)+1)
+            ENDIF
+         ENDDO
+         out(t) = acc
+      ENDDO
+      END
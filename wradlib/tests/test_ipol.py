@@ -3,11 +3,18 @@
 # Copyright (c) 2016, wradlib developers.
 # Distributed under the MIT License. See LICENSE.txt for more info.
 
+import sys
+import types
 import numpy as np
+import wradlib
 import wradlib.ipol as ipol
 import wradlib.georef as georef
 import unittest
 import warnings
+try:
+    from importlib import reload
+except ImportError:
+    pass
 
 
 class InterpolationTest(unittest.TestCase):
@@ -28,6 +35,12 @@ class InterpolationTest(unittest.TestCase):
                   ipol.cov_sph(h, 2.3, 20.4),
                   ipol.cov_nug(h, 5.0, 0.)])
         self.assertTrue(c(h) == ci)
+        # shape parameters only apply to the models which take them
+        c = ipol.parse_covariogram('1.0 Exp(10.)^2 + 1.0 Mat(10.)^1.5')
+        ci = ipol.cov_exp(h, 1., 10.) + ipol.cov_mat(h, 1., 10., 1.5)
+        self.assertTrue(np.allclose(c(h), ci))
+        self.assertRaises(ValueError, ipol.parse_covariogram, '1.0 Mat(10.)')
+        self.assertRaises(ValueError, ipol.parse_covariogram, '1.0 Xyz(10.)')
 
     def test_cov_lin(self):
         self.assertTrue(
@@ -68,6 +81,12 @@ class InterpolationTest(unittest.TestCase):
         self.assertTrue(np.allclose(
             ipol.cov_mat([0., 5., 10.], sill=2., rng=10., shp=0.25),
             np.array([2., 0.74916629, 0.39961004])))
+        self.assertTrue(np.allclose(
+            ipol.cov_mat([0., 5., 10.], sill=2., rng=10., shp=1.5),
+            np.array([2., 1.30740539, 0.59564154])))
+        self.assertTrue(np.allclose(
+            ipol.cov_mat([0., 5., 10.], sill=2., rng=10., shp=2.5),
+            np.array([2., 1.40499152, 0.63456673])))
 
     def test_cov_gau(self):
         self.assertTrue(np.allclose(ipol.cov_gau([0., 5., 10.]),
@@ -90,6 +109,174 @@ class InterpolationTest(unittest.TestCase):
             ipol.cov_cau([0., 5., 10.], sill=2., rng=10., alpha=0.5, beta=1.5),
             np.array([2., 0.40202025, 0.25])))
 
+    def test_Idw_1(self):
+        """testing the basic behaviour of the Idw class"""
+        ip = ipol.Idw(self.src, self.trg, nnearest=2)
+        res = ip(self.vals)
+        self.assertTrue(np.allclose(res, np.array([[1., 2., 3.],
+                                                   [2., 2., 2.],
+                                                   [1.2, 2., 2.8],
+                                                   [3., 2., 1.]])))
+        res = ip(self.vals[:, 0])
+        self.assertTrue(np.allclose(res, np.array([1., 2., 1.2, 3.])))
+        self.assertEqual(res.dtype, np.float32)
+        self.assertTrue(np.allclose(ip.weights.sum(axis=1), 1.))
+        self.assertEqual(ip.weights.shape, ip.ix.shape)
+        self.assertFalse(ip.weights.flags.writeable)
+        # write into a preallocated array
+        out = np.zeros((3, 4), dtype=np.float32)
+        res = ip(self.vals[:, 1], out=out[1])
+        self.assertTrue(np.allclose(out, np.array([[0., 0., 0., 0.],
+                                                   [2., 2., 2., 2.],
+                                                   [0., 0., 0., 0.]])))
+        # values without any fields
+        self.assertEqual(ip(np.empty((2, 0))).shape, (4, 0))
+        # a target on a source point ignores NaN at the other neighbours
+        src = np.array([[0., 0.], [1., 0.], [2., 0.], [3., 0.], [4., 0.]])
+        v = np.array([1., np.nan, 3., 4., 5.])
+        ip = ipol.Idw(src, src[:1], nnearest=3)
+        res = ip(np.column_stack([v, v]))
+        self.assertTrue(np.allclose(res, np.array([[1., 1.]])))
+
+    @unittest.skipIf(ipol._f_idw is None, 'speedup module not available')
+    def test_Idw_speedup(self):
+        """testing the speedup kernel against the numpy evaluation of Idw"""
+        src = np.random.RandomState(42).uniform(0., 10., (50, 2))
+        trg = np.vstack((src[:5], np.random.RandomState(43).uniform(
+            0., 10., (100, 2))))
+        vals = np.sin(src[:, 0]) * np.cos(src[:, 1])
+        vals[5:10] = np.nan
+        ip = ipol.Idw(src, trg, nnearest=6)
+        # float32 output uses the kernel, float64 output the numpy path
+        res = ip(vals)
+        ref = ip(vals, out=np.empty(len(trg)))
+        self.assertTrue(np.allclose(res, ref, equal_nan=True))
+        self.assertTrue(np.allclose(res[:5], vals[:5]))
+
+    def test_Idw_speedup_outdated(self):
+        """testing Idw with a speedup module built without the Idw kernel"""
+        saved = (sys.modules.get('wradlib.speedup'),
+                 getattr(wradlib, 'speedup', None))
+        stub = types.ModuleType('wradlib.speedup')
+        sys.modules['wradlib.speedup'] = wradlib.speedup = stub
+        try:
+            reload(ipol)
+            self.assertTrue(ipol._speedup is stub)
+            self.assertTrue(ipol._f_idw is None)
+            ip = ipol.Idw(self.src, self.trg, nnearest=2)
+            res = ip(self.vals[:, 0])
+            self.assertTrue(np.allclose(res, np.array([1., 2., 1.2, 3.])))
+        finally:
+            if saved[0] is None:
+                del sys.modules['wradlib.speedup']
+                del wradlib.speedup
+            else:
+                sys.modules['wradlib.speedup'] = saved[0]
+                wradlib.speedup = saved[1]
+            reload(ipol)
+
+    def test_Linear_1(self):
+        """testing the basic behaviour of the Linear class"""
+        src = np.array([[0., 0.], [4., 0.], [0., 4.], [4., 4.]])
+        trg = np.array([[0., 0.], [2., 2.], [1., 0.], [5., 5.]])
+        vals = np.array([[0., 1.], [4., 1.], [0., 1.], [4., 1.]])
+        ip = ipol.Linear(src, trg)
+        res = ip(vals)
+        self.assertTrue(np.allclose(res, np.array([[0., 1.],
+                                                   [2., 1.],
+                                                   [1., 1.],
+                                                   [np.nan, np.nan]]),
+                                    equal_nan=True))
+        res = ip(vals[:, 0], fill_value=-1.)
+        self.assertTrue(np.allclose(res, np.array([0., 2., 1., -1.])))
+
+    def test_query_subset(self):
+        """testing interpolators which ignore some of the source points"""
+        exclude = np.array([True, False])
+        for Interpolator in [ipol.Nearest, ipol.Idw]:
+            ip = Interpolator(self.src, self.trg)
+            ip = ip.query_subset(self.trg[:2], exclude)
+            self.assertEqual(ip.numtargets, 2)
+            self.assertTrue(np.allclose(ip(self.vals),
+                                        np.array([[3., 2., 1.],
+                                                  [3., 2., 1.]])))
+            self.assertRaises(ipol.MissingSourcesError, ip.query_subset,
+                              self.trg, np.array([True, True]))
+        # many excluded sources, scattered and in a contiguous block
+        src = np.random.RandomState(42).uniform(0., 100., (500, 2))
+        trg = np.random.RandomState(43).uniform(0., 100., (200, 2))
+        vals = np.hypot(src[:, 0], src[:, 1])
+        exclude = np.random.RandomState(44).uniform(size=500) < 0.5
+        exclude[src[:, 0] < 50.] = True
+        good = ~exclude
+        for Interpolator in [ipol.Nearest, ipol.Idw]:
+            ip = Interpolator(src, trg).query_subset(trg, exclude)
+            ref = Interpolator(src[good], trg)
+            self.assertTrue(np.allclose(ip(vals), ref(vals[good])))
+
+    def test_interpolate(self):
+        """testing the handling of missing values in interpolate"""
+        src = np.arange(10.)[:, None]
+        trg = np.linspace(0., 9., 19)[:, None]
+        vals = np.hstack((np.sin(src), np.sin(src), 10. + np.sin(src)))
+        # missing values with the same pattern in the last two columns
+        vals[3:5, 1:] = np.nan
+        res = ipol.interpolate(src, trg, vals, ipol.Idw, nnearest=2)
+        self.assertFalse(np.any(np.isnan(res)))
+        full = ipol.Idw(src, trg, nnearest=2)(vals[:, 0])
+        self.assertTrue(np.allclose(res[:, 0], full))
+        good = np.isfinite(vals[:, 1])
+        part = ipol.Idw(src[good], trg, nnearest=2)(vals[good, 1:])
+        self.assertTrue(np.allclose(res[:, 1:], part))
+        # values with more than two dimensions must not contain NaN
+        vals = np.dstack((vals, vals))
+        self.assertRaises(Exception, ipol.interpolate, src, trg, vals,
+                          ipol.Idw, nnearest=2)
+        vals[3:5] = 1.
+        res = ipol.interpolate(src, trg, vals, ipol.Idw, nnearest=2)
+        full = ipol.Idw(src, trg, nnearest=2)(vals)
+        self.assertEqual(res.shape, (19, 3, 2))
+        self.assertTrue(np.allclose(res, full))
+
+    def test_interpolate_polar(self):
+        """testing the filling of masked bins of a polar field"""
+        # 8 azimuths and 5 range bins, the data is linear in x and y
+        angles = np.radians(np.arange(0., 360., 45.))[:, np.newaxis]
+        ranges = np.arange(0.5, 5.)
+        data = np.cos(angles) * ranges + 2. * np.sin(angles) * ranges
+        mask = np.zeros(data.shape, dtype=bool)
+        mask[[1, 2, 4, 4, 6], [0, 0, 2, 3, 4]] = True
+        # the nearest valid neighbour of each masked bin is unique
+        res = ipol.interpolate_polar(data, mask=mask)
+        self.assertTrue(np.allclose(res[~mask], data[~mask]))
+        near = data[[0, 3, 4, 4, 6], [0, 0, 1, 4, 3]]
+        self.assertTrue(np.allclose(res[mask], near))
+        # the linear field is reproduced inside the convex hull, the bin at
+        # the rim is filled by its nearest neighbour
+        res = ipol.interpolate_polar(np.ma.array(data, mask=mask),
+                                     Interpolator=ipol.Linear)
+        self.assertTrue(np.allclose(res[:6], data[:6]))
+        self.assertTrue(np.allclose(res[6], [data[6, 0], data[6, 1],
+                                             data[6, 2], data[6, 3],
+                                             data[6, 3]]))
+        self.assertTrue(np.allclose(res[7], data[7]))
+
+    def test_polar_xy(self):
+        """testing the cache of the polar bin coordinates"""
+        ipol._polar_xy_cache.clear()
+        binx, biny = ipol._polar_xy(4, 3)
+        self.assertTrue(np.allclose(binx[:3], [0.5, 1.5, 2.5]))
+        self.assertTrue(np.allclose(biny[3:6], [0.5, 1.5, 2.5]))
+        self.assertFalse(binx.flags.writeable or biny.flags.writeable)
+        x, y = ipol._polar_xy(4, 3)
+        self.assertTrue(x is binx and y is biny)
+        # the cache is emptied, once a 9th shape is requested
+        for nrng in range(4, 11):
+            ipol._polar_xy(4, nrng)
+        self.assertEqual(len(ipol._polar_xy_cache), 8)
+        ipol._polar_xy(4, 11)
+        self.assertEqual(list(ipol._polar_xy_cache), [(4, 11)])
+
     def test_OrdinaryKriging_1(self):
         """testing the basic behaviour of the OrdinaryKriging class"""
 